@@ -8,8 +8,12 @@ Author: Juno-50 | Day 8 - AWS Learning Journey
 
 import boto3
 import argparse
+import logging
+import sys
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 class EC2Controller:
     """EC2 Instance Controller"""
     
@@ -17,36 +21,32 @@ class EC2Controller:
         """Initialize EC2 client."""
         self.ec2 = boto3.client('ec2', region_name=region)
         self.region = region
-        print(f"✅ Connected to EC2 in region: {region}\n")
+        logger.info("✅ Connected to EC2 in region: %s", region)
     
     def find_instances_by_tag(self, tag_key, tag_value):
         """Find instances matching a tag."""
-        print(f"🔍 Searching for instances with tag '{tag_key}={tag_value}'...")
+        logger.info("🔍 Searching for instances with tag '%s=%s'...", tag_key, tag_value)
         
-        response = self.ec2.describe_instances(
+        # Tag filtering happens server-side; the paginator covers fleets larger than one page
+        paginator = self.ec2.get_paginator('describe_instances')
+        pages = paginator.paginate(
             Filters=[{'Name': f'tag:{tag_key}', 'Values': [tag_value]}]
         )
         
         instance_ids = []
         instance_details = []
         
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                instance_ids.append(instance['InstanceId'])
-                
-                # Get instance name
-                name = 'No Name'
-                if instance.get('Tags'):
-                    for tag in instance['Tags']:
-                        if tag['Key'] == 'Name':
-                            name = tag['Value']
-                
-                instance_details.append({
-                    'InstanceId': instance['InstanceId'],
-                    'Name': name,
-                    'State': instance['State']['Name'],
-                    'Type': instance['InstanceType']
-                })
+        for page in pages:
+            for reservation in page['Reservations']:
+                for instance in reservation['Instances']:
+                    instance_ids.append(instance['InstanceId'])
+                    name = next((t['Value'] for t in instance.get('Tags') or () if t['Key'] == 'Name'), 'No Name')
+                    instance_details.append({
+                        'InstanceId': instance['InstanceId'],
+                        'Name': name,
+                        'State': instance['State']['Name'],
+                        'Type': instance['InstanceType']
+                    })
         
         # Display found instances
         if instance_details:
@@ -57,80 +57,78 @@ class EC2Controller:
                 print(f"{inst['InstanceId']:<20} {inst['Name']:<25} {inst['State']:<15} {inst['Type']:<15}")
             print()
         else:
-            print(f"⚠️  No instances found with tag '{tag_key}={tag_value}'")
+            logger.warning("⚠️  No instances found with tag '%s=%s'", tag_key, tag_value)
         
         return instance_ids
     
     def start_instances(self, instance_ids, dry_run=False):
         """Start EC2 instances."""
         if not instance_ids:
-            print("No instances to start")
+            logger.info("No instances to start")
             return False
         
         try:
             if dry_run:
-                print(f"🔍 DRY RUN: Would start {len(instance_ids)} instance(s)")
+                logger.info("🔍 DRY RUN: Would start %d instance(s)", len(instance_ids))
                 return True
             
-            print(f"▶️  Starting {len(instance_ids)} instance(s)...")
+            logger.info("▶️  Starting %d instance(s)...", len(instance_ids))
             self.ec2.start_instances(InstanceIds=instance_ids)
             
             # Wait for instances to start
-            print("Waiting for instances to start...", end="")
+            logger.info("Waiting for instances to start...")
             waiter = self.ec2.get_waiter('instance_running')
             waiter.wait(InstanceIds=instance_ids)
-            print(" Done!")
             
-            print(f"✅ Successfully started {len(instance_ids)} instance(s)")
+            logger.info("✅ Successfully started %d instance(s)", len(instance_ids))
             return True
         except Exception as e:
-            print(f"❌ Error starting instances: {e}")
+            logger.error("❌ Error starting instances: %s", e)
             return False
     
     def stop_instances(self, instance_ids, dry_run=False):
         """Stop EC2 instances."""
         if not instance_ids:
-            print("No instances to stop")
+            logger.info("No instances to stop")
             return False
         
         try:
             if dry_run:
-                print(f"🔍 DRY RUN: Would stop {len(instance_ids)} instance(s)")
+                logger.info("🔍 DRY RUN: Would stop %d instance(s)", len(instance_ids))
                 return True
             
-            print(f"⏸️  Stopping {len(instance_ids)} instance(s)...")
+            logger.info("⏸️  Stopping %d instance(s)...", len(instance_ids))
             self.ec2.stop_instances(InstanceIds=instance_ids)
             
             # Wait for instances to stop
-            print("Waiting for instances to stop...", end="")
+            logger.info("Waiting for instances to stop...")
             waiter = self.ec2.get_waiter('instance_stopped')
             waiter.wait(InstanceIds=instance_ids)
-            print(" Done!")
             
-            print(f"✅ Successfully stopped {len(instance_ids)} instance(s)")
+            logger.info("✅ Successfully stopped %d instance(s)", len(instance_ids))
             return True
         except Exception as e:
-            print(f"❌ Error stopping instances: {e}")
+            logger.error("❌ Error stopping instances: %s", e)
             return False
     
     def restart_instances(self, instance_ids, dry_run=False):
         """Restart EC2 instances."""
         if not instance_ids:
-            print("No instances to restart")
+            logger.info("No instances to restart")
             return False
         
         try:
             if dry_run:
-                print(f"🔍 DRY RUN: Would restart {len(instance_ids)} instance(s)")
+                logger.info("🔍 DRY RUN: Would restart %d instance(s)", len(instance_ids))
                 return True
             
-            print(f"🔄 Restarting {len(instance_ids)} instance(s)...")
+            logger.info("🔄 Restarting %d instance(s)...", len(instance_ids))
             self.ec2.reboot_instances(InstanceIds=instance_ids)
             
-            print(f"✅ Successfully restarted {len(instance_ids)} instance(s)")
+            logger.info("✅ Successfully restarted %d instance(s)", len(instance_ids))
             return True
         except Exception as e:
-            print(f"❌ Error restarting instances: {e}")
+            logger.error("❌ Error restarting instances: %s", e)
             return False
 
 def parse_tag(tag_string):
@@ -159,6 +157,8 @@ def main():
     parser.add_argument('--region', default='us-east-1', help='AWS region (default: us-east-1)')
     
     args = parser.parse_args()
+    # Status lines share stdout with the printed tables so piped output stays in order
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
     
     # Print header
     print("=" * 80)
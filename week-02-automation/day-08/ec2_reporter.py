@@ -1,86 +1,134 @@
 #!/usr/bin/env python3
 """
 EC2 Instance Reporter
-Lists all EC2 instances with key details and exports to CSV
+Lists all EC2 instances with key details and exports to CSV (or Parquet)
 Author: Juno-50 | Day 8 - AWS Learning Journey
 """
 
+import argparse
 import boto3
 import csv
+import functools
+import importlib.util
+import itertools
+import sys
 from datetime import datetime
 
+@functools.lru_cache(maxsize=None)
+def get_ec2_client(region='us-east-1'):
+    """Return a cached EC2 client for the region (reused across calls)."""
+    return boto3.client('ec2', region_name=region)
+
 def get_instance_name(instance):
     """Extract instance name from tags."""
-    if instance.get('Tags'):
-        for tag in instance['Tags']:
-            if tag['Key'] == 'Name':
-                return tag['Value']
-    return 'No Name'
+    return next((tag['Value'] for tag in instance.get('Tags') or () if tag['Key'] == 'Name'), 'No Name')
 
 def list_ec2_instances():
-    """List all EC2 instances in the account."""
+    """Yield all EC2 instances in the account, one page of results at a time."""
     print("Connecting to AWS EC2...")
-    ec2 = boto3.client('ec2', region_name='us-east-1')
+    ec2 = get_ec2_client('us-east-1')
     print("Fetching instances...\n")
     
-    response = ec2.describe_instances()
-    instances_data = []
-    
-    for reservation in response['Reservations']:
-        for instance in reservation['Instances']:
-            instance_info = {
-                'InstanceId': instance['InstanceId'],
-                'Name': get_instance_name(instance),
-                'State': instance['State']['Name'],
-                'InstanceType': instance['InstanceType'],
-                'PublicIP': instance.get('PublicIpAddress', 'N/A'),
-                'PrivateIP': instance.get('PrivateIpAddress', 'N/A'),
-                'LaunchTime': instance['LaunchTime'].strftime('%Y-%m-%d %H:%M:%S')
-            }
-            instances_data.append(instance_info)
-    
-    return instances_data
+    paginator = ec2.get_paginator('describe_instances')
+    for page in paginator.paginate():
+        for reservation in page['Reservations']:
+            for instance in reservation['Instances']:
+                yield {
+                    'InstanceId': instance['InstanceId'],
+                    'Name': get_instance_name(instance),
+                    'State': instance['State']['Name'],
+                    'InstanceType': instance['InstanceType'],
+                    'PublicIP': instance.get('PublicIpAddress', 'N/A'),
+                    'PrivateIP': instance.get('PrivateIpAddress', 'N/A'),
+                    'LaunchTime': instance['LaunchTime'].strftime('%Y-%m-%d %H:%M:%S')
+                }
 
 def print_instances_table(instances):
-    """Print instances in formatted table."""
+    """Print instances (a list of row dicts) in formatted table."""
     if not instances:
         print("No EC2 instances found.")
         return
     
-    print(f"{'Name':<20} {'Instance ID':<20} {'State':<15} {'Type':<15} {'Public IP':<15}")
-    print("-" * 90)
-    
-    for inst in instances:
-        print(f"{inst['Name']:<20} {inst['InstanceId']:<20} {inst['State']:<15} "
-              f"{inst['InstanceType']:<15} {inst['PublicIP']:<15}")
+    # Build the whole table first and emit it with one write instead of one print per row
+    lines = [
+        f"\nFound {len(instances)} instance(s)\n",
+        f"{'Name':<20} {'Instance ID':<20} {'State':<15} {'Type':<15} {'Public IP':<15}",
+        "-" * 90,
+    ]
+    lines.extend(
+        f"{inst['Name']:<20} {inst['InstanceId']:<20} {inst['State']:<15} "
+        f"{inst['InstanceType']:<15} {inst['PublicIP']:<15}"
+        for inst in instances
+    )
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
+
+FIELDNAMES = ['Name', 'InstanceId', 'State', 'InstanceType', 'PublicIP', 'PrivateIP', 'LaunchTime']
 
 def export_to_csv(instances, filename='ec2_instances.csv'):
-    """Export instances to CSV file."""
-    if not instances:
+    """Export instances to CSV file, streaming rows as they arrive."""
+    rows = iter(instances)
+    first = next(rows, None)
+    if first is None:
         print("No data to export.")
         return
     
-    fieldnames = ['Name', 'InstanceId', 'State', 'InstanceType', 'PublicIP', 'PrivateIP', 'LaunchTime']
-    
-    with open(filename, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+    # Large write buffer means far fewer write() syscalls for big inventories
+    with open(filename, 'w', newline='', buffering=1 << 20, encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
         writer.writeheader()
-        for instance in instances:
-            writer.writerow(instance)
+        writer.writerow(first)
+        writer.writerows(rows)
+    
+    print(f"\n✅ Data exported to {filename}")
+
+def export_to_parquet(instances, filename='ec2_instances.parquet', batch_size=1000):
+    """Export instances to a zstd-compressed Parquet file (requires pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow") from e
+    
+    schema = pa.schema([(name, pa.string()) for name in FIELDNAMES])
+    rows = iter(instances)
+    batch = list(itertools.islice(rows, batch_size))
+    if not batch:
+        print("No data to export.")
+        return
+    
+    # Write one record batch per chunk so memory stays bounded for large fleets
+    with pq.ParquetWriter(filename, schema, compression='zstd') as writer:
+        while batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            batch = list(itertools.islice(rows, batch_size))
     
     print(f"\n✅ Data exported to {filename}")
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description='List EC2 instances and export them to CSV or Parquet')
+    parser.add_argument('--no-table', action='store_true', help='Only write the export file, skip the console table')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help='Export format (default: csv)')
+    args = parser.parse_args()
+    if args.format == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        parser.error("--format parquet needs pyarrow: pip install pyarrow")
+    
+    export = export_to_parquet if args.format == 'parquet' else export_to_csv
+    
     print("=" * 90)
     print("EC2 Instance Reporter")
     print("=" * 90)
     
     try:
-        instances = list_ec2_instances()
-        print(f"\nFound {len(instances)} instance(s)\n")
-        print_instances_table(instances)
-        export_to_csv(instances)
+        if args.no_table:
+            # Nothing else needs the rows, so stream them from the paginator straight into the file
+            export(list_ec2_instances())
+        else:
+            instances = list(list_ec2_instances())
+            print_instances_table(instances)
+            if instances:
+                export(instances)
     except Exception as e:
         print(f"\n❌ Error: {e}")
         print("Make sure AWS credentials are configured.")
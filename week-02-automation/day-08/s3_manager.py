@@ -6,31 +6,48 @@ Author: Juno-50 | Day 8 - AWS Learning Journey
 """
 
 import boto3
+import itertools
+import logging
 import os
+import sys
+import threading
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Files below this size are sent with a single PutObject
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+# Default number of files upload_files sends at once
+UPLOAD_WORKERS = 8
+# Part uploads in flight across all large files (one shared TransferManager)
+TRANSFER_MAX_CONCURRENCY = 16
+
 class S3Manager:
     """S3 Bucket Manager class - Handles all S3 operations."""
     
     def __init__(self, region='us-east-1'):
         """Initialize S3 client."""
-        self.s3 = boto3.client('s3', region_name=region)
+        # Pool covers every upload_files worker plus every in-flight multipart part, so none wait for a connection
+        config = Config(max_pool_connections=UPLOAD_WORKERS + TRANSFER_MAX_CONCURRENCY)
+        self.s3 = boto3.client('s3', region_name=region, config=config)
         self.region = region
-        print(f"✅ Connected to S3 in region: {region}")
+        self._transfer = None  # created on first multipart-sized upload
+        self._transfer_lock = threading.Lock()
+        logger.info("✅ Connected to S3 in region: %s", region)
     
     def create_bucket(self, bucket_name):
         """Create S3 bucket."""
         try:
-            # Check if bucket already exists
-            try:
-                self.s3.head_bucket(Bucket=bucket_name)
-                print(f"⚠️  Bucket '{bucket_name}' already exists")
-                return False
-            except:
-                pass
-            
-            # Create bucket
             if self.region == 'us-east-1':
+                # us-east-1 answers CreateBucket on a bucket you own with 200 (and resets its ACLs)
+                # instead of BucketAlreadyOwnedByYou, so check for it first
+                if self._bucket_exists(bucket_name):
+                    logger.warning("⚠️  Bucket '%s' already exists", bucket_name)
+                    return False
                 self.s3.create_bucket(Bucket=bucket_name)
             else:
                 self.s3.create_bucket(
@@ -38,12 +55,31 @@ class S3Manager:
                     CreateBucketConfiguration={'LocationConstraint': self.region}
                 )
             
-            print(f"✅ Bucket '{bucket_name}' created successfully")
+            logger.info("✅ Bucket '%s' created successfully", bucket_name)
             return True
-        except Exception as e:
-            print(f"❌ Error creating bucket: {e}")
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code == 'BucketAlreadyOwnedByYou':
+                logger.warning("⚠️  Bucket '%s' already exists", bucket_name)
+            elif code == 'BucketAlreadyExists':
+                logger.warning("⚠️  Bucket name '%s' is already taken by another account", bucket_name)
+            else:
+                logger.error("❌ Error creating bucket: %s", e)
+            return False
+        except BotoCoreError as e:
+            logger.error("❌ Error creating bucket: %s", e)
             return False
     
+    def _bucket_exists(self, bucket_name):
+        """Return True if HeadBucket succeeds. 404/403 return False so CreateBucket reports the real outcome."""
+        try:
+            self.s3.head_bucket(Bucket=bucket_name)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchBucket', 'NotFound', '403'):
+                return False
+            raise
+    
     def upload_file(self, file_path, bucket_name, object_name=None):
         """Upload file to S3 bucket."""
         if object_name is None:
@@ -51,45 +87,84 @@ class S3Manager:
         
         try:
             if not os.path.exists(file_path):
-                print(f"❌ File not found: {file_path}")
+                logger.error("❌ File not found: %s", file_path)
                 return False
             
-            self.s3.upload_file(file_path, bucket_name, object_name)
             file_size = os.path.getsize(file_path)
-            print(f"✅ Uploaded '{file_path}' to '{bucket_name}/{object_name}' ({file_size} bytes)")
+            if file_size < MULTIPART_THRESHOLD:
+                # Small file: one PutObject, no transfer thread pool
+                with open(file_path, 'rb') as f:
+                    self.s3.put_object(Bucket=bucket_name, Key=object_name, Body=f)
+            else:
+                self._get_transfer_manager().upload(file_path, bucket_name, object_name).result()
+            logger.info("✅ Uploaded '%s' to '%s/%s' (%d bytes)", file_path, bucket_name, object_name, file_size)
             return True
-        except Exception as e:
-            print(f"❌ Error uploading file: {e}")
+        except (ClientError, BotoCoreError, OSError) as e:
+            logger.error("❌ Error uploading file: %s", e)
             return False
     
-    def list_objects(self, bucket_name):
-        """List all objects in bucket."""
+    def _get_transfer_manager(self):
+        """Return a TransferManager for large uploads, reused across calls."""
+        with self._transfer_lock:
+            if self._transfer is None:
+                config = TransferConfig(multipart_threshold=MULTIPART_THRESHOLD, max_concurrency=TRANSFER_MAX_CONCURRENCY)
+                self._transfer = create_transfer_manager(self.s3, config)
+        return self._transfer
+    
+    def upload_files(self, file_paths, bucket_name, max_workers=UPLOAD_WORKERS):
+        """Upload several files concurrently so disk reads overlap with network sends.
+        max_workers is capped at UPLOAD_WORKERS, which the client's connection pool is sized for.
+        Returns the number of files uploaded successfully."""
+        file_paths = list(file_paths)
+        if not file_paths:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(max_workers, UPLOAD_WORKERS, len(file_paths))) as executor:
+            results = list(executor.map(lambda path: self.upload_file(path, bucket_name), file_paths))
+        uploaded = sum(results)
+        logger.info("📦 Uploaded %d/%d file(s) to '%s'", uploaded, len(file_paths), bucket_name)
+        return uploaded
+    
+    def iter_objects(self, bucket_name, prefix=None):
+        """Yield every object in bucket (optionally under prefix), one page at a time."""
+        paginator = self.s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix or ''):
+            yield from page.get('Contents', [])
+    
+    def print_objects(self, bucket_name, prefix=None, limit=None):
+        """Print objects in bucket, stopping after limit rows. Returns the number printed."""
         try:
-            response = self.s3.list_objects_v2(Bucket=bucket_name)
-            
-            if 'Contents' not in response:
-                print(f"Bucket '{bucket_name}' is empty")
-                return
-            
-            print(f"\nObjects in '{bucket_name}':")
-            print(f"{'Name':<40} {'Size (bytes)':<15} {'Last Modified'}")
-            print("-" * 80)
-            
-            for obj in response['Contents']:
-                print(f"{obj['Key']:<40} {obj['Size']:<15} {obj['LastModified']}")
-            
-            print(f"\nTotal objects: {len(response['Contents'])}")
-        except Exception as e:
-            print(f"❌ Error listing objects: {e}")
+            objects = self.iter_objects(bucket_name, prefix)
+            if limit is not None:
+                objects = itertools.islice(objects, limit)
+            rows = [f"{obj['Key']:<40} {obj['Size']:<15} {obj['LastModified']}" for obj in objects]
+        except (ClientError, BotoCoreError) as e:
+            logger.error("❌ Error listing objects: %s", e)
+            return 0
+        
+        if not rows:
+            logger.info("Bucket '%s' is empty", bucket_name)
+            return 0
+        
+        print(f"\nObjects in '{bucket_name}':")
+        print(f"{'Name':<40} {'Size (bytes)':<15} {'Last Modified'}")
+        print("-" * 80)
+        print("\n".join(rows))
+        suffix = " (limit reached)" if limit is not None and len(rows) == limit else ""
+        print(f"\nTotal objects shown: {len(rows)}{suffix}")
+        return len(rows)
+    
+    def list_objects(self, bucket_name, prefix=None, limit=None):
+        """List objects in bucket (all pages)."""
+        return self.print_objects(bucket_name, prefix, limit)
     
     def download_file(self, bucket_name, object_name, file_path):
         """Download file from S3."""
         try:
             self.s3.download_file(bucket_name, object_name, file_path)
-            print(f"✅ Downloaded '{bucket_name}/{object_name}' to '{file_path}'")
+            logger.info("✅ Downloaded '%s/%s' to '%s'", bucket_name, object_name, file_path)
             return True
-        except Exception as e:
-            print(f"❌ Error downloading file: {e}")
+        except (ClientError, BotoCoreError, OSError) as e:
+            logger.error("❌ Error downloading file: %s", e)
             return False
     
     def delete_bucket(self, bucket_name, confirm=True):
@@ -97,28 +172,40 @@ class S3Manager:
         if confirm:
             response = input(f"⚠️  Delete bucket '{bucket_name}'? (yes/no): ")
             if response.lower() != 'yes':
-                print("Deletion cancelled")
+                logger.info("Deletion cancelled")
                 return False
         
         try:
-            # First, delete all objects in bucket
-            response = self.s3.list_objects_v2(Bucket=bucket_name)
-            if 'Contents' in response:
-                print(f"Deleting {len(response['Contents'])} object(s)...")
-                for obj in response['Contents']:
-                    self.s3.delete_object(Bucket=bucket_name, Key=obj['Key'])
-                    print(f"  Deleted: {obj['Key']}")
+            # First, delete all objects in bucket (every page, up to 1000 keys per request)
+            paginator = self.s3.get_paginator('list_objects_v2')
+            keys = paginator.paginate(Bucket=bucket_name).search('Contents[].Key')
+            deleted = 0
+            while True:
+                chunk = [key for key in itertools.islice(keys, 1000) if key is not None]
+                if not chunk:
+                    break
+                response = self.s3.delete_objects(
+                    Bucket=bucket_name,
+                    Delete={'Objects': [{'Key': key} for key in chunk], 'Quiet': True}
+                )
+                errors = response.get('Errors', [])
+                for error in errors:
+                    logger.error("  ❌ Failed to delete %s: %s", error['Key'], error['Message'])
+                deleted += len(chunk) - len(errors)
+                logger.info("  Deleted %d object(s) in this batch (%d total)", len(chunk) - len(errors), deleted)
             
             # Now delete the bucket
             self.s3.delete_bucket(Bucket=bucket_name)
-            print(f"✅ Bucket '{bucket_name}' deleted successfully")
+            logger.info("✅ Bucket '%s' deleted successfully", bucket_name)
             return True
-        except Exception as e:
-            print(f"❌ Error deleting bucket: {e}")
+        except (ClientError, BotoCoreError) as e:
+            logger.error("❌ Error deleting bucket: %s", e)
             return False
 
 def main():
     """Main function - demonstrates S3Manager usage."""
+    # Status lines share stdout with the printed tables so piped output stays in order
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
     print("=" * 80)
     print("S3 Bucket Manager")
     print("=" * 80)
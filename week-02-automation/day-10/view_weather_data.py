@@ -4,7 +4,7 @@ Utility script to browse and inspect weather JSON objects stored in S3 by the we
 Features:
 - List recent objects for a given date and/or city
 - Download and pretty-print JSON for selected objects
-- Filter by date prefix (YYYY-MM-DD) and city name
+- Filter by date prefix (YYYY-MM-DD) and city name (with --date, also inside S3_BATCH_UPLOAD batch objects)
 
 AWS credentials are resolved via the default AWS credential chain.
 
@@ -14,16 +14,30 @@ Configuration:
 
 from __future__ import annotations
 import argparse
-import json
+import gzip
+import io
 import logging
 import os
-from datetime import datetime
+import re
+from datetime import date
 from typing import Any, Dict, List, Optional
 
 import boto3
+import orjson
+from boto3.exceptions import S3TransferFailedError
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import BotoCoreError, ClientError
 from dotenv import load_dotenv
 
+# [0-9] rather than \d: \d also matches non-ASCII digits, which would never match a stored key.
+_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+
+DOWNLOAD_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+)
+
 
 def setup_logging() -> None:
     """Configure basic console logging with timestamps."""
@@ -47,6 +61,11 @@ def build_s3_client():
     return boto3.client("s3")
 
 
+def normalize_city_for_filter(city: str) -> str:
+    """Normalize a city name the way keys are built. Example: "New York" -> "new_york" """
+    return city.strip().replace(" ", "_").lower()
+
+
 def build_prefix_for_date_and_city(
     date_str: Optional[str], city: Optional[str],
 ) -> str:
@@ -55,52 +74,68 @@ def build_prefix_for_date_and_city(
     - stored layout: YYYY/MM/DD/city_HHMMSS.json"""
     prefix_parts: List[str] = []
     if date_str:
+        match = _DATE_RE.fullmatch(date_str)
         try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
+            if not match:
+                raise ValueError("does not match YYYY-MM-DD")
+            # Cheap calendar check (rejects e.g. 2026-02-30) without going through strptime.
+            date(int(match[1]), int(match[2]), int(match[3]))
         except ValueError as exc:
             raise ValueError(f"Invalid date format '{date_str}', expected YYYY-MM-DD") from exc
-        prefix_parts.append(dt.strftime("%Y/%m/%d"))
+        prefix_parts.append(f"{match[1]}/{match[2]}/{match[3]}")
     if city:
-        city_normalized = city.strip().replace(" ", "_").lower()
+        city_normalized = normalize_city_for_filter(city)
         prefix_parts.append(f"{city_normalized}_")
     if not prefix_parts:
         return ""
     return "/".join(prefix_parts)
 
 
+def filter_batch_records(records: List[Dict[str, Any]], city: str) -> List[Dict[str, Any]]:
+    """Keep only the records of one city from a parsed NDJSON batch object."""
+    city_normalized = normalize_city_for_filter(city)
+    return [r for r in records if normalize_city_for_filter(str(r.get("city") or "")) == city_normalized]
+
+
 def list_objects(
     client, bucket: str, prefix: str, max_items: int,
 ) -> List[Dict[str, Any]]:
     """List up to max_items objects under the given prefix."""
     results: List[Dict[str, Any]] = []
-    kwargs = {"Bucket": bucket, "Prefix": prefix} if prefix else {"Bucket": bucket}
-    while True:
-        try:
-            resp = client.list_objects_v2(**kwargs)
-        except (ClientError, BotoCoreError) as exc:
-            logging.error("Failed to list objects from s3://%s/%s: %s", bucket, prefix, exc)
-            break
-        contents = resp.get("Contents", [])
-        for obj in contents:
-            results.append(obj)
-            if len(results) >= max_items:
-                return results
-        if not resp.get("IsTruncated"):
-            break
-        kwargs["ContinuationToken"] = resp.get("NextContinuationToken")
+    paginator = client.get_paginator("list_objects_v2")
+    pages = paginator.paginate(
+        Bucket=bucket, Prefix=prefix or "",
+        PaginationConfig={"MaxItems": max_items, "PageSize": 1000},
+    )
+    try:
+        for page in pages:
+            results.extend(page.get("Contents", []))
+    except (ClientError, BotoCoreError) as exc:
+        logging.error("Failed to list objects from s3://%s/%s: %s", bucket, prefix, exc)
     return results
 
 
-def fetch_object_json(client, bucket: str, key: str) -> Dict[str, Any]:
-    """Download a JSON object from S3 and parse it."""
+def fetch_object_json(client, bucket: str, key: str, size: Optional[int] = None) -> Any:
+    """Download a JSON object from S3 and parse it (NDJSON batch objects parse to a list of records).
+    size is the listed object size: objects below the multipart threshold (or of unknown size) are
+    fetched with a single GetObject; larger ones with parallel ranged GETs via download_fileobj."""
     try:
-        resp = client.get_object(Bucket=bucket, Key=key)
-    except (ClientError, BotoCoreError) as exc:
+        if size is None or size < DOWNLOAD_CONFIG.multipart_threshold:
+            body = client.get_object(Bucket=bucket, Key=key)["Body"].read()
+        else:
+            buf = io.BytesIO()
+            client.download_fileobj(bucket, key, buf, Config=DOWNLOAD_CONFIG)
+            body = buf.getvalue()
+    except (ClientError, BotoCoreError, S3TransferFailedError) as exc:
         raise RuntimeError(f"Failed to download s3://{bucket}/{key}: {exc}") from exc
-    body = resp["Body"].read()
     try:
-        return json.loads(body.decode("utf-8"))
-    except ValueError as exc:
+        # Objects uploaded with S3_GZIP_UPLOAD are stored gzip-encoded; boto3 returns them as-is.
+        if body[:2] == b"\x1f\x8b":
+            body = gzip.decompress(body)
+        if key.endswith(".ndjson"):
+            return [orjson.loads(line) for line in body.splitlines() if line.strip()]
+        return orjson.loads(body)
+    except (OSError, ValueError) as exc:
         raise RuntimeError(f"Failed to decode JSON for s3://{bucket}/{key}: {exc}") from exc
 
 
@@ -149,18 +184,25 @@ def main() -> int:
     prefix = build_prefix_for_date_and_city(args.date, args.city)
     logging.info("Listing objects in bucket='%s' with prefix='%s'", bucket, prefix or "<root>")
     objects = list_objects(client, bucket, prefix, max_items=args.limit)
+    if args.city and args.date and len(objects) < args.limit:
+        # With S3_BATCH_UPLOAD a city's records live inside the day's batch_*.ndjson objects.
+        batch_prefix = build_prefix_for_date_and_city(args.date, None) + "/batch_"
+        logging.info("Listing batch objects with prefix='%s'", batch_prefix)
+        objects += list_objects(client, bucket, batch_prefix, max_items=args.limit - len(objects))
     print_summary_table(objects)
 
     if args.raw and objects:
         key = objects[0]["Key"]
         logging.info("Downloading first object: s3://%s/%s", bucket, key)
         try:
-            data = fetch_object_json(client, bucket, key)
+            data = fetch_object_json(client, bucket, key, objects[0].get("Size"))
         except Exception as exc:
             logging.error("Failed to load JSON from s3://%s/%s: %s", bucket, key, exc)
             return 1
+        if args.city and key.endswith(".ndjson"):
+            data = filter_batch_records(data, args.city)
         print(" --- JSON content (first object) ---")
-        print(json.dumps(data, indent=2, ensure_ascii=False))
+        print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8"))
 
     return 0
 
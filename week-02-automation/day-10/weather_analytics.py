@@ -3,27 +3,66 @@ Analytics utility for weather JSON data stored in S3 by weather_to_s3.py.
 
 Features:
 - Scan a date range (prefix-based) and optional city filter
+- Reads per-city JSON objects and NDJSON batch objects (S3_BATCH_UPLOAD)
 - Aggregate per-city statistics (count, min/avg/max temperature)
+- Optional S3 Select projection of city/temperature (WEATHER_S3_SELECT), with GET fallback
+- Optional --async-io mode using aioboto3 for very large scans
 - Print summary table to the console
 
 AWS credentials are resolved via the default AWS credential chain.
 Configuration:
 - S3_BUCKET_NAME (required, same as in weather_to_s3.py)
+- WEATHER_CACHE (optional, default: ~/.cache/weather) local cache of fetched records keyed by ETag
+- WEATHER_S3_SELECT (optional, default false) fetch only city/temperature via S3 Select instead of a GET
+- S3_GZIP_UPLOAD (optional, same as in weather_to_s3.py) tells S3 Select that bodies are gzip-compressed
 """
 
 from __future__ import annotations
 import argparse
-import json
+import asyncio
+import functools
+import gzip
 import logging
 import os
-from collections import defaultdict
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional
+import re
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
 import boto3
+import numpy as np
+import orjson
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 from dotenv import load_dotenv
 
+try:
+    import aioboto3
+except ImportError:  # optional: only needed for --async-io
+    aioboto3 = None
+
+logger = logging.getLogger(__name__)
+
+# Number of concurrent GetObject calls; each worker spends most of its time waiting on the network.
+FETCH_WORKERS = 32
+# Upper bound on submitted-but-unconsumed downloads while listing is still in progress.
+MAX_IN_FLIGHT = 256
+# Upper bound on concurrent GetObject calls in --async-io mode.
+ASYNC_CONCURRENCY = 256
+# Leading bytes of a gzip stream.
+GZIP_MAGIC = b"\x1f\x8b"
+# Key suffix of multi-city objects written with S3_BATCH_UPLOAD (one JSON record per line).
+BATCH_SUFFIX = ".ndjson"
+# Strict YYYY-MM-DD; date.fromisoformat alone also accepts forms like 20260218 and 2026-W08-3.
+_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+# S3 Select error codes that mean Select is unavailable for the account/bucket, not just for one object.
+SELECT_UNAVAILABLE_CODES = frozenset({"AccessDenied", "MethodNotAllowed", "NotImplemented", "UnsupportedOperation"})
+
+# Set when S3 Select is off (not enabled, or rejected by S3) so objects go straight to GetObject.
+_select_disabled = threading.Event()
+
 
 def setup_logging() -> None:
     """Configure console logging with timestamps."""
@@ -39,26 +78,61 @@ def load_env_bucket() -> str:
     bucket = os.getenv("S3_BUCKET_NAME")
     if not bucket:
         raise RuntimeError("S3_BUCKET_NAME must be set in environment/.env")
+    return bucket
+
+
+@functools.lru_cache(maxsize=None)
+def get_s3_client():
+    """Return a process-wide S3 client using the default credential chain.
+    The connection pool is sized for the fetch thread pool; adaptive retries absorb S3 throttling."""
+    config = Config(
+        max_pool_connections=64,
+        retries={"mode": "adaptive", "max_attempts": 10},
+    )
+    return boto3.client("s3", config=config)
+
+
+def load_cache_dir() -> Path:
+    """Resolve the local record cache directory from WEATHER_CACHE (default: ~/.cache/weather)."""
+    return Path(os.getenv("WEATHER_CACHE", "~/.cache/weather")).expanduser()
+
+
+def load_use_select() -> bool:
+    """Whether WEATHER_S3_SELECT is enabled. S3 Select is closed to new AWS accounts, so it is opt-in."""
+    return os.getenv("WEATHER_S3_SELECT", "").strip().lower() in ("1", "true", "yes")
+
 
-return bucket
+@functools.lru_cache(maxsize=None)
+def select_compression_type() -> str:
+    """CompressionType for S3 Select: GZIP when objects are written with S3_GZIP_UPLOAD enabled."""
+    gzip_upload = os.getenv("S3_GZIP_UPLOAD", "").strip().lower() in ("1", "true", "yes")
+    return "GZIP" if gzip_upload else "NONE"
 
 
 def build_s3_client():
-    """Build an S3 client using the default credential chain."""
-    return boto3.client("s3")
+    """Build an S3 client using the default credential chain (cached per process)."""
+    return get_s3_client()
 
 
-def date_range(start: datetime, end: datetime) -> Iterable[datetime]:
+def parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD command-line date. Raises ValueError for any other format."""
+    if not _DATE_RE.fullmatch(value):
+        raise ValueError(f"'{value}' does not match YYYY-MM-DD")
+    return date.fromisoformat(value)
+
+
+def date_range(start: date, end: date) -> Iterable[date]:
     """Inclusive date range generator (day by day)."""
     cur = start
+    one_day = timedelta(days=1)
     while cur <= end:
         yield cur
-        cur += timedelta(days=1)
+        cur += one_day
 
 
-def prefix_for_date(dt: datetime) -> str:
+def prefix_for_date(day: date) -> str:
     """Convert a date into the S3 prefix used by weather_to_s3.py. Example: 2026-02-18 -> "2026/02/18/" """
-    return dt.strftime("%Y/%m/%d/")
+    return "%04d/%02d/%02d/" % (day.year, day.month, day.day)
 
 
 def normalize_city_for_filter(city: Optional[str]) -> Optional[str]:
@@ -68,68 +142,292 @@ def normalize_city_for_filter(city: Optional[str]) -> Optional[str]:
     return city.strip().replace(" ", "_").lower()
 
 
-def list_objects_for_prefix(client, bucket: str, prefix: str) -> List[Dict[str, Any]]:
-    """List all objects for a single prefix."""
-    results: List[Dict[str, Any]] = []
-    kwargs = {"Bucket": bucket, "Prefix": prefix}
-    while True:
-        try:
-            resp = client.list_objects_v2(**kwargs)
-        except (ClientError, BotoCoreError) as exc:
-            logging.error("Failed to list objects from s3://%s/%s: %s", bucket, prefix, exc)
-            break
-        contents = resp.get("Contents", [])
-        results.extend(contents)
-        if not resp.get("IsTruncated"):
-            break
-        kwargs["ContinuationToken"] = resp.get("NextContinuationToken")
-    return results
-
-
-def fetch_json(client, bucket: str, key: str) -> Optional[Dict[str, Any]]:
-    """Download an S3 JSON object and parse it. Returns None if download or parsing fails."""
+def list_objects_for_prefix(client, bucket: str, prefix: str) -> Iterator[Dict[str, Any]]:
+    """Yield all objects for a single prefix, page by page."""
+    paginator = client.get_paginator("list_objects_v2")
+    try:
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix, PaginationConfig={"PageSize": 1000}):
+            yield from page.get("Contents", [])
+    except (ClientError, BotoCoreError) as exc:
+        logger.error("Failed to list objects from s3://%s/%s: %s", bucket, prefix, exc)
+
+
+def maybe_gunzip(data: bytes) -> bytes:
+    """Decompress bodies uploaded with S3_GZIP_UPLOAD (boto3 does not undo Content-Encoding: gzip)."""
+    return gzip.decompress(data) if data[:2] == GZIP_MAGIC else data
+
+
+def is_batch_key(key: str) -> bool:
+    """True for NDJSON batch objects (YYYY/MM/DD/batch_HHMMSS.ndjson) written with S3_BATCH_UPLOAD."""
+    return key.endswith(BATCH_SUFFIX)
+
+
+def city_from_key(key: str) -> str:
+    """Extract the normalized city from a per-city key. Example: "2026/02/18/new_york_120000.json" -> "new_york" """
+    return key.rsplit("/", 1)[-1].rsplit("_", 1)[0]
+
+
+def parse_records(data: bytes, key: str) -> List[Dict[str, Any]]:
+    """Parse an object body into weather records: one per line for batch objects, else a single document."""
+    if is_batch_key(key):
+        return [orjson.loads(line) for line in data.splitlines() if line.strip()]
+    return [orjson.loads(data)]
+
+
+def fetch_records(client, bucket: str, key: str) -> Optional[List[Dict[str, Any]]]:
+    """Download an S3 JSON/NDJSON object and parse its records. Returns None if download or parsing fails."""
     try:
         resp = client.get_object(Bucket=bucket, Key=key)
-        data = resp["Body"].read()
-        return json.loads(data.decode("utf-8"))
-    except (ClientError, BotoCoreError, ValueError) as exc:
-        logging.error("Failed to load JSON from s3://%s/%s: %s", bucket, key, exc)
+        return parse_records(maybe_gunzip(resp["Body"].read()), key)
+    except (ClientError, BotoCoreError, OSError, ValueError) as exc:
+        logger.error("Failed to load JSON from s3://%s/%s: %s", bucket, key, exc)
+        return None
+
+
+def fetch_temp_and_city(client, bucket: str, key: str) -> Optional[List[Dict[str, Any]]]:
+    """Fetch only the city and temperature_c fields of each record in an S3 object via S3 Select.
+    S3 evaluates the projection server-side, so only two fields cross the network.
+    Uses a plain GET when Select is disabled, and falls back to one if Select fails for the object.
+    The first account-level rejection disables Select for the rest of the process."""
+    if _select_disabled.is_set():
+        return fetch_records(client, bucket, key)
+    try:
+        resp = client.select_object_content(
+            Bucket=bucket,
+            Key=key,
+            ExpressionType="SQL",
+            Expression="SELECT s.city, s.temperature_c FROM S3Object s",
+            InputSerialization={
+                "JSON": {"Type": "LINES" if is_batch_key(key) else "DOCUMENT"},
+                "CompressionType": select_compression_type(),
+            },
+            OutputSerialization={"JSON": {}},
+        )
+        chunks = [event["Records"]["Payload"] for event in resp["Payload"] if "Records" in event]
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in SELECT_UNAVAILABLE_CODES:
+            if not _select_disabled.is_set():
+                _select_disabled.set()
+                logger.warning("S3 Select is not available (%s); using GetObject for all objects", exc)
+        else:
+            logger.warning("S3 Select failed for s3://%s/%s (%s); falling back to GET", bucket, key, exc)
+        return fetch_records(client, bucket, key)
+    except BotoCoreError as exc:
+        logger.warning("S3 Select failed for s3://%s/%s (%s); falling back to GET", bucket, key, exc)
+        return fetch_records(client, bucket, key)
+    # Select emits one JSON record per line for both DOCUMENT and LINES input.
+    try:
+        return [orjson.loads(line) for line in b"".join(chunks).splitlines() if line.strip()]
+    except ValueError as exc:
+        logger.error("Failed to decode S3 Select result for s3://%s/%s: %s", bucket, key, exc)
         return None
 
 
-@dataclass
-class CityStats:
-    """Accumulated statistics for a single city."""
-    count: int = 0
-    temp_sum: float = 0.0
-    temp_min: Optional[float] = None
-    temp_max: Optional[float] = None
+def cache_path_for(cache_dir: Path, obj: Dict[str, Any]) -> Optional[Path]:
+    """Map a listed S3 object to its cache file, keyed by ETag. Returns None if the ETag is missing."""
+    etag = str(obj.get("ETag") or "").strip('"')
+    if not etag:
+        return None
+    return cache_dir / etag[:2] / etag
 
 
-def update_stats(stats: CityStats, temp_c: float) -> None:
-    """Update CityStats with a new temperature value."""
-    stats.count += 1
-    stats.temp_sum += temp_c
-    if stats.temp_min is None or temp_c < stats.temp_min:
-        stats.temp_min = temp_c
-    if stats.temp_max is None or temp_c > stats.temp_max:
-        stats.temp_max = temp_c
+def load_cached_record(cache_dir: Path, obj: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Return the cached city/temperature records for an object, or None on a cache miss."""
+    path = cache_path_for(cache_dir, obj)
+    if path is None:
+        return None
+    try:
+        cached = orjson.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    # Entries written before batch objects were supported hold a single record.
+    return [cached] if isinstance(cached, dict) else cached
+
+
+def store_cached_record(
+    cache_dir: Path, bucket: str, obj: Dict[str, Any], docs: Optional[List[Dict[str, Any]]],
+) -> Optional[List[Dict[str, Any]]]:
+    """Reduce fetched documents to their city/temperature records and store them in the local cache.
+    The ETag changes whenever the object does, so cached entries never need revalidating."""
+    path = cache_path_for(cache_dir, obj)
+    if not docs or path is None:
+        return docs
+    records = [{"city": doc.get("city"), "temperature_c": doc.get("temperature_c")} for doc in docs]
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(orjson.dumps(records))
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning("Failed to cache s3://%s/%s at %s: %s", bucket, obj["Key"], path, exc)
+    return records
+
+
+def filter_city_records(
+    obj: Dict[str, Any], docs: Optional[List[Dict[str, Any]]], city_filter: Optional[str],
+) -> Optional[List[Dict[str, Any]]]:
+    """Keep only city_filter's records from a batch object; per-city objects are already filtered by key prefix."""
+    if not docs or not city_filter or not is_batch_key(obj["Key"]):
+        return docs
+    return [doc for doc in docs if normalize_city_for_filter(str(doc.get("city") or "")) == city_filter]
+
+
+def fetch_and_cache_record(
+    client, bucket: str, obj: Dict[str, Any], cache_dir: Path, city_filter: Optional[str] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Fetch an object's city/temperature records from S3, store them in the local cache and apply city_filter."""
+    docs = store_cached_record(cache_dir, bucket, obj, fetch_temp_and_city(client, bucket, obj["Key"]))
+    return filter_city_records(obj, docs, city_filter)
+
+
+async def fetch_records_async(
+    bucket: str, objs: List[Dict[str, Any]], cache_dir: Path, city_filter: Optional[str] = None,
+) -> List[Optional[List[Dict[str, Any]]]]:
+    """Download and cache records for many objects from a single event loop thread (requires aioboto3).
+    At most ASYNC_CONCURRENCY GetObject calls are in flight at once."""
+    session = aioboto3.Session()
+    semaphore = asyncio.Semaphore(ASYNC_CONCURRENCY)
+    config = Config(
+        max_pool_connections=ASYNC_CONCURRENCY,
+        retries={"mode": "adaptive", "max_attempts": 10},
+    )
+    async with session.client("s3", config=config) as s3:
+        async def fetch_one(obj: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+            key = obj["Key"]
+            async with semaphore:
+                try:
+                    resp = await s3.get_object(Bucket=bucket, Key=key)
+                    async with resp["Body"] as stream:
+                        docs = parse_records(maybe_gunzip(await stream.read()), key)
+                except (ClientError, BotoCoreError, OSError, ValueError) as exc:
+                    logger.error("Failed to load JSON from s3://%s/%s: %s", bucket, key, exc)
+                    return None
+            # The cache write is blocking file I/O, so keep it off the event loop.
+            records = await asyncio.to_thread(store_cached_record, cache_dir, bucket, obj, docs)
+            return filter_city_records(obj, records, city_filter)
+
+        return await asyncio.gather(*(fetch_one(obj) for obj in objs))
+
+
+class CityStatsColumns(NamedTuple):
+    """Per-city statistics stored column-wise: one dict per metric, keyed by city name."""
+    count: Dict[str, int]
+    tsum: Dict[str, float]
+    tmin: Dict[str, float]
+    tmax: Dict[str, float]
+
+
+def record_docs(cities: List[str], temps: List[float], docs: Optional[List[Dict[str, Any]]]) -> None:
+    """Append each downloaded weather record's city and temperature to the parallel lists."""
+    for doc in docs or ():
+        temp = doc.get("temperature_c")
+        if not isinstance(temp, (int, float)):
+            continue
+        cities.append(str(doc.get("city") or "unknown"))
+        temps.append(float(temp))
+
+
+def aggregate_city_stats(cities: List[str], temps: List[float]) -> CityStatsColumns:
+    """Reduce parallel city/temperature lists into per-city statistics in one vectorized pass."""
+    if not cities:
+        return CityStatsColumns({}, {}, {}, {})
+    names, idx = np.unique(np.asarray(cities), return_inverse=True)
+    values = np.asarray(temps, dtype=np.float64)
+    counts = np.bincount(idx, minlength=names.size)
+    sums = np.bincount(idx, weights=values, minlength=names.size)
+    mins = np.full(names.size, np.inf)
+    np.minimum.at(mins, idx, values)
+    maxs = np.full(names.size, -np.inf)
+    np.maximum.at(maxs, idx, values)
+    keys = names.tolist()
+    return CityStatsColumns(
+        count=dict(zip(keys, counts.tolist())),
+        tsum=dict(zip(keys, sums.tolist())),
+        tmin=dict(zip(keys, mins.tolist())),
+        tmax=dict(zip(keys, maxs.tolist())),
+    )
 
 
-def print_city_stats_table(city_stats: Dict[str, CityStats]) -> None:
+def print_city_stats_table(stats: CityStatsColumns) -> None:
     """Print a table summarizing per-city statistics."""
-    if not city_stats:
-        logging.info("No data points matched the requested filters.")
+    if not stats.count:
+        logger.info("No data points matched the requested filters.")
         return
 
     header = f"{'City':<20} {'Count':>8} {'MinTemp(C)':>12} {'AvgTemp(C)':>12} {'MaxTemp(C)':>12}"
-    print(header)
-    print("-" * len(header))
-    for city, stats in sorted(city_stats.items()):
-        avg = stats.temp_sum / stats.count if stats.count else 0.0
-        min_temp = stats.temp_min if stats.temp_min is not None else float("nan")
-        max_temp = stats.temp_max if stats.temp_max is not None else float("nan")
-        print(f"{city:<20} {stats.count:>8} {min_temp:>12.2f} {avg:>12.2f} {max_temp:>12.2f}")
+    lines = [header, "-" * len(header)]
+    for city in sorted(stats.count):
+        count = stats.count[city]
+        avg = stats.tsum[city] / count
+        lines.append(f"{city:<20} {count:>8} {stats.tmin[city]:>12.2f} {avg:>12.2f} {stats.tmax[city]:>12.2f}")
+    lines.append("")
+    # One buffered write for the whole table instead of a print() per row.
+    sys.stdout.write("\n".join(lines))
+
+
+def iter_range_objects(
+    client, bucket: str, start: date, end: date, city_filter: Optional[str],
+) -> Iterator[Dict[str, Any]]:
+    """Yield listed objects for every day in the range, optionally narrowed to one city."""
+    for day in date_range(start, end):
+        day_prefix = prefix_for_date(day)
+        if not city_filter:
+            logger.info("Scanning s3://%s/%s", bucket, day_prefix)
+            yield from list_objects_for_prefix(client, bucket, day_prefix)
+            continue
+        # Keys are YYYY/MM/DD/<city>_HHMMSS.json, so S3 can filter by city server-side.
+        # The prefix also matches longer names (new_ -> new_york_), so the key's city is checked exactly.
+        city_prefix = f"{day_prefix}{city_filter}_"
+        logger.info("Scanning s3://%s/%s", bucket, city_prefix)
+        for obj in list_objects_for_prefix(client, bucket, city_prefix):
+            if city_from_key(obj["Key"]) == city_filter:
+                yield obj
+        # Batch objects hold every city and are narrowed record by record after download.
+        batch_prefix = f"{day_prefix}batch_"
+        logger.info("Scanning s3://%s/%s", bucket, batch_prefix)
+        yield from list_objects_for_prefix(client, bucket, batch_prefix)
+
+
+def collect_threaded(
+    client, bucket: str, objects: Iterable[Dict[str, Any]], cache_dir: Path,
+    cities: List[str], temps: List[float], city_filter: Optional[str] = None,
+) -> None:
+    """Fetch records on a thread pool while listing is still in progress.
+    Listing feeds the pool as pages arrive, so GETs overlap with the remaining LISTs.
+    Results are collected on the calling thread so no locking is needed."""
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        for obj in objects:
+            cached = load_cached_record(cache_dir, obj)
+            if cached is not None:
+                # Cache hits are resolved here and never occupy a worker slot.
+                record_docs(cities, temps, filter_city_records(obj, cached, city_filter))
+                continue
+            pending.add(executor.submit(fetch_and_cache_record, client, bucket, obj, cache_dir, city_filter))
+            if len(pending) >= MAX_IN_FLIGHT:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record_docs(cities, temps, future.result())
+
+        for future in as_completed(pending):
+            record_docs(cities, temps, future.result())
+
+
+def collect_async(
+    bucket: str, objects: Iterable[Dict[str, Any]], cache_dir: Path,
+    cities: List[str], temps: List[float], city_filter: Optional[str] = None,
+) -> None:
+    """Fetch records with aioboto3 on one event loop; suited to scans of tens of thousands of objects.
+    Listing completes first, then all cache misses are downloaded concurrently."""
+    misses: List[Dict[str, Any]] = []
+    for obj in objects:
+        cached = load_cached_record(cache_dir, obj)
+        if cached is not None:
+            record_docs(cities, temps, filter_city_records(obj, cached, city_filter))
+        else:
+            misses.append(obj)
+    for docs in asyncio.run(fetch_records_async(bucket, misses, cache_dir, city_filter)):
+        record_docs(cities, temps, docs)
 
 
 def main() -> int:
@@ -140,56 +438,52 @@ def main() -> int:
     parser.add_argument("--start-date", help="Start date (YYYY-MM-DD) for range analysis.")
     parser.add_argument("--end-date", help="End date (YYYY-MM-DD) for range analysis.")
     parser.add_argument("--city", help="Optional city filter (case-insensitive)")
+    parser.add_argument(
+        "--async-io", action="store_true",
+        help="Download with aioboto3 on a single event loop (for very large scans; falls back to threads if not installed).",
+    )
     args = parser.parse_args()
 
     if args.date and (args.start_date or args.end_date):
-        logging.error("--date cannot be combined with --start-date/--end-date")
+        logger.error("--date cannot be combined with --start-date/--end-date")
         return 1
 
     try:
         bucket = load_env_bucket()
     except Exception as exc:
-        logging.error("Configuration error: %s", exc)
+        logger.error("Configuration error: %s", exc)
         return 1
 
     try:
         if args.date:
-            start = end = datetime.strptime(args.date, "%Y-%m-%d")
+            start = end = parse_date(args.date)
         else:
             if not args.start_date or not args.end_date:
-                logging.error("Either --date OR both --start-date and --end-date must be provided.")
+                logger.error("Either --date OR both --start-date and --end-date must be provided.")
                 return 1
-            start = datetime.strptime(args.start_date, "%Y-%m-%d")
-            end = datetime.strptime(args.end_date, "%Y-%m-%d")
+            start = parse_date(args.start_date)
+            end = parse_date(args.end_date)
     except ValueError as exc:
-        logging.error("Invalid date format: %s", exc)
+        logger.error("Invalid date format: %s", exc)
         return 1
 
     city_filter = normalize_city_for_filter(args.city)
+    cache_dir = load_cache_dir()
+    if not load_use_select():
+        _select_disabled.set()
     client = build_s3_client()
-    city_stats: Dict[str, CityStats] = defaultdict(CityStats)
-
-    for dt in date_range(start, end):
-        prefix = prefix_for_date(dt)
-        logging.info("Scanning s3://%s/%s", bucket, prefix)
-        objs = list_objects_for_prefix(client, bucket, prefix)
-        for obj in objs:
-            key = obj["Key"]
-            if city_filter:
-                filename = key.rsplit("/", 1)[-1]
-                city_part = filename.split("_", 1)[0]
-                if city_part.lower() != city_filter:
-                    continue
-            doc = fetch_json(client, bucket, key)
-            if not doc:
-                continue
-            temp = doc.get("temperature_c")
-            city_name = str(doc.get("city") or "unknown")
-            if not isinstance(temp, (int, float)):
-                continue
-            update_stats(city_stats[city_name], float(temp))
-
-    print_city_stats_table(city_stats)
+    objects = iter_range_objects(client, bucket, start, end, city_filter)
+    cities: List[str] = []
+    temps: List[float] = []
+
+    if args.async_io and aioboto3 is None:
+        logger.warning("--async-io requested but aioboto3 is not installed; using the thread pool instead.")
+    if args.async_io and aioboto3 is not None:
+        collect_async(bucket, objects, cache_dir, cities, temps, city_filter)
+    else:
+        collect_threaded(client, bucket, objects, cache_dir, cities, temps, city_filter)
+
+    print_city_stats_table(aggregate_city_stats(cities, temps))
     return 0
 
 
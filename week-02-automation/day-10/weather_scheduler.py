@@ -1,9 +1,10 @@
 """weather_scheduler.py
 Simple scheduler wrapper for weather_to_s3.py.
 
-This script periodically invokes weather_to_s3.py using the same Python interpreter,
-relying on the default AWS credential chain and the .env configuration already used
-by the main pipeline.
+This script imports weather_to_s3 once and periodically calls its main() in-process,
+so interpreter startup, boto3 imports and pooled HTTPS connections are reused across
+runs. It relies on the default AWS credential chain and the .env configuration already
+used by the main pipeline.
 
 Configuration (via environment/.env):
 - WEATHER_FETCH_INTERVAL_SECONDS (optional, default: 900 seconds / 15 minutes)
@@ -20,12 +21,12 @@ from __future__ import annotations
 import argparse
 import logging
 import os
-import subprocess
-import sys
 import time
 from typing import Optional
 from dotenv import load_dotenv
 
+import weather_to_s3
+
 
 def setup_logging() -> None:
     """Configure console logging with timestamps."""
@@ -59,23 +60,25 @@ def load_interval_seconds(default: int = 900) -> int:
 
 def run_pipeline_once() -> int:
     """
-    Invoke weather_to_s3.py as a subprocess using the current Python interpreter.
-    Returns the subprocess exit code.
+    Run weather_to_s3.main() in the current process.
+    Returns the pipeline exit code (1 if it raised).
     """
-    cmd = [sys.executable, "weather_to_s3.py"]
-    logging.info("Executing command: %s", " ".join(cmd))
+    logging.info("Running weather_to_s3 pipeline")
     try:
-        result = subprocess.run(cmd, check=False)
-        logging.info("weather_to_s3.py exited with code %d", result.returncode)
-        return result.returncode
-    except Exception as exc:
-        logging.error("Failed to run weather_to_s3.py: %s", exc)
+        exit_code = weather_to_s3.main()
+        logging.info("weather_to_s3 finished with exit code %d", exit_code)
+        return exit_code
+    except Exception:
+        logging.exception("Failed to run weather_to_s3 pipeline")
         return 1
 
 
 def run_scheduler_loop(interval_seconds: int) -> int:
     """
-    Run an infinite loop that executes the pipeline and sleeps.
+    Run an infinite loop that executes the pipeline on a fixed cadence.
+    Runs start every interval_seconds measured on the monotonic clock, so the
+    pipeline's own runtime does not push the schedule back. If a run overruns
+    its slot, the next one starts immediately and the cadence restarts from there.
     The loop continues even if individual runs fail; failures are logged.
     Ctrl+C (KeyboardInterrupt) stops the loop.
     """
@@ -83,7 +86,9 @@ def run_scheduler_loop(interval_seconds: int) -> int:
         "Starting scheduler loop with interval=%d seconds. Press Ctrl+C to stop.",
         interval_seconds,
     )
+    deadline = time.monotonic()
     while True:
+        deadline += interval_seconds
         exit_code = run_pipeline_once()
         if exit_code == 0:
             logging.info("Pipeline run completed successfully.")
@@ -92,9 +97,14 @@ def run_scheduler_loop(interval_seconds: int) -> int:
                 "Pipeline run completed with non-zero exit code: %d",
                 exit_code
             )
-        logging.info("Sleeping for %d seconds before next run...", interval_seconds)
+        sleep_for = deadline - time.monotonic()
+        if sleep_for <= 0:
+            logging.warning("Pipeline run overran the %d second interval; starting next run now.", interval_seconds)
+            deadline = time.monotonic()
+            continue
+        logging.info("Sleeping for %.1f seconds before next run...", sleep_for)
         try:
-            time.sleep(interval_seconds)
+            time.sleep(sleep_for)
         except KeyboardInterrupt:
             logging.info("Interrupted by user; stopping scheduler loop.")
             return 0
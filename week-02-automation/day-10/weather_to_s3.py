@@ -6,26 +6,41 @@ Configuration is provided via environment variables loaded from a .env file:
 - S3_BUCKET_NAME
 - CITIES (comma-separated list of city names)
 - Optional: S3_LOG_PREFIX
+- Optional: S3_BATCH_UPLOAD (true/false, default false) upload one NDJSON object per run instead of one JSON object per city
+- Optional: S3_GZIP_UPLOAD (true/false, default false) gzip object bodies and store them with Content-Encoding: gzip
+- Optional: INCLUDE_RAW_SOURCE (true/false, default false) keep OpenWeather's id/dt under raw_source in each payload
 
 AWS credentials are resolved via the default AWS credential chain (AWS Toolkit, env vars, shared config/credentials files, IAM role, etc.).
 """
 
 from __future__ import annotations
-import json
+import functools
+import gzip
+import io
 import logging
+import math
 import os
+import random
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple, TypedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, TypedDict
 
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
-import requests
-from requests import Response
+import orjson
 from dotenv import load_dotenv
 
+# boto3 and requests are imported where first used; boto3 alone adds hundreds of ms to a cold start.
+if TYPE_CHECKING:
+    import requests
+    from requests import Response
+
+# Maximum number of concurrent OpenWeather requests per run.
+FETCH_WORKERS = 32
+# Maximum number of concurrent S3 uploads per run.
+UPLOAD_WORKERS = 16
+
 
 # ---------------------------
 # Configuration & Data Models
@@ -38,10 +53,13 @@ class Config:
     s3_bucket_name: str
     cities: List[str]
     s3_log_prefix: Optional[str] = None
+    batch_upload: bool = False
+    gzip_upload: bool = False
+    include_raw_source: bool = False
 
 
-class WeatherData(TypedDict):
-    """Structured weather payload to store in S3."""
+class _WeatherDataRequired(TypedDict):
+    """Fields present in every stored weather payload."""
     city: str
     country: Optional[str]
     coordinates: Dict[str, float]
@@ -53,15 +71,23 @@ class WeatherData(TypedDict):
     weather_description: str
     wind_speed_ms: float
     timestamp_utc: str
+
+
+class WeatherData(_WeatherDataRequired, total=False):
+    """Structured weather payload to store in S3. raw_source is only present with INCLUDE_RAW_SOURCE."""
     raw_source: Dict[str, object]
 
 
 class WeatherAPIError(Exception):
     """Custom exception for weather API failures."""
-    def __init__(self, message: str, status_code: Optional[int] = None, retriable: bool = False) -> None:
+    def __init__(
+        self, message: str, status_code: Optional[int] = None, retriable: bool = False,
+        retry_after: Optional[float] = None,
+    ) -> None:
         super().__init__(message)
         self.status_code = status_code
         self.retriable = retriable
+        self.retry_after = retry_after
 
 
 # -------------
@@ -87,6 +113,9 @@ def load_env_config() -> Config:
     bucket = os.getenv("S3_BUCKET_NAME")
     cities_raw = os.getenv("CITIES", "")
     log_prefix = os.getenv("S3_LOG_PREFIX")
+    batch_upload = os.getenv("S3_BATCH_UPLOAD", "").strip().lower() in ("1", "true", "yes")
+    gzip_upload = os.getenv("S3_GZIP_UPLOAD", "").strip().lower() in ("1", "true", "yes")
+    include_raw_source = os.getenv("INCLUDE_RAW_SOURCE", "").strip().lower() in ("1", "true", "yes")
 
     missing: List[str] = []
     if not api_key:
@@ -111,6 +140,9 @@ def load_env_config() -> Config:
         s3_bucket_name=bucket,
         cities=cities,
         s3_log_prefix=log_prefix or None,
+        batch_upload=batch_upload,
+        gzip_upload=gzip_upload,
+        include_raw_source=include_raw_source,
     )
 
 
@@ -134,14 +166,40 @@ def _classify_retriable(status_code: Optional[int]) -> bool:
     return False
 
 
+@functools.lru_cache(maxsize=None)
+def get_http_session() -> requests.Session:
+    """Return a process-wide requests Session so TLS connections to OpenWeather are kept alive and reused.
+    The pool holds one connection per fetch worker; retries stay with fetch_weather_with_retry."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=FETCH_WORKERS, max_retries=Retry(total=0))
+    session.mount("https://", adapter)
+    return session
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds. HTTP-date values are ignored (None)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
 def call_openweather_api(city: str, api_key: str, timeout_seconds: int = 10) -> Response:
     """HTTP request to OpenWeatherMap Current Weather API."""
+    from requests.exceptions import RequestException
+
     base_url = "https://api.openweathermap.org/data/2.5/weather"
     params = {"q": city, "appid": api_key}
 
     try:
-        resp = requests.get(base_url, params=params, timeout=timeout_seconds)
-    except requests.exceptions.RequestException as exc:
+        resp = get_http_session().get(base_url, params=params, timeout=timeout_seconds)
+    except RequestException as exc:
         raise WeatherAPIError(
             f"Network error while calling OpenWeather for city '{city}': {exc}",
             status_code=None, retriable=True,
@@ -151,20 +209,27 @@ def call_openweather_api(city: str, api_key: str, timeout_seconds: int = 10) ->
         retriable = _classify_retriable(resp.status_code)
         message = f"HTTP {resp.status_code} from OpenWeather for city '{city}'"
         try:
-            body = resp.json()
+            body = orjson.loads(resp.content)
             if isinstance(body, dict) and "message" in body:
                 message += f": {body['message']}"
         except Exception:
             pass
-        raise WeatherAPIError(message=message, status_code=resp.status_code, retriable=retriable)
+        raise WeatherAPIError(
+            message=message, status_code=resp.status_code, retriable=retriable,
+            retry_after=_parse_retry_after(resp.headers.get("Retry-After")),
+        )
 
     return resp
 
 
-def parse_weather_response(city: str, resp: Response) -> WeatherData:
-    """Convert OpenWeather JSON response to WeatherData."""
+def parse_weather_response(
+    city: str, resp: Response, timestamp_utc: str, include_raw_source: bool = False,
+) -> WeatherData:
+    """Convert OpenWeather JSON response to WeatherData, stamped with the run's timestamp_utc."""
+    # The current-weather body is ~1 KB, so a full orjson parse is cheaper than an on-demand
+    # parser (e.g. simdjson); revisit if the ~30 KB 5-day forecast endpoint is ever ingested.
     try:
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except ValueError as exc:
         raise WeatherAPIError(f"Failed to parse JSON for city '{city}': {exc}", retriable=True) from exc
 
@@ -190,9 +255,10 @@ def parse_weather_response(city: str, resp: Response) -> WeatherData:
             "weather_main": str(weather_entry.get("main", "")),
             "weather_description": str(weather_entry.get("description", "")),
             "wind_speed_ms": float(wind.get("speed", 0.0)),
-            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-            "raw_source": {"id": data.get("id"), "dt": data.get("dt")},
+            "timestamp_utc": timestamp_utc,
         }
+        if include_raw_source:
+            result["raw_source"] = {"id": data.get("id"), "dt": data.get("dt")}
     except (KeyError, TypeError, ValueError) as exc:
         raise WeatherAPIError(f"Unexpected response structure for city '{city}': {exc}", retriable=False) from exc
 
@@ -200,9 +266,13 @@ def parse_weather_response(city: str, resp: Response) -> WeatherData:
 
 
 def fetch_weather_with_retry(
-    city: str, config: Config, max_attempts: int = 3, initial_backoff_seconds: float = 1.0
+    city: str, config: Config, timestamp_utc: str, max_attempts: int = 3,
+    initial_backoff_seconds: float = 1.0, max_backoff_seconds: float = 30.0,
 ) -> Optional[WeatherData]:
-    """Fetch weather with retry logic and exponential backoff."""
+    """Fetch weather with retry logic.
+    Waits honor the server's Retry-After header when present; otherwise they use decorrelated
+    jitter around an exponential backoff so concurrent workers don't retry in lockstep.
+    Every wait is capped at max_backoff_seconds."""
     attempt = 0
     backoff = initial_backoff_seconds
     while attempt < max_attempts:
@@ -210,7 +280,7 @@ def fetch_weather_with_retry(
         try:
             logging.info("Fetching weather for '%s' (attempt %d/%d)", city, attempt, max_attempts)
             resp = call_openweather_api(city, config.openweather_api_key)
-            return parse_weather_response(city, resp)
+            return parse_weather_response(city, resp, timestamp_utc, config.include_raw_source)
         except WeatherAPIError as exc:
             logging.error(
                 "Weather API error for '%s' (attempt %d/%d): %s (status=%s, retriable=%s)",
@@ -219,34 +289,70 @@ def fetch_weather_with_retry(
             if not getattr(exc, "retriable", False):
                 return None
             if attempt < max_attempts:
-                time.sleep(backoff)
-                backoff *= 2
+                retry_after = getattr(exc, "retry_after", None)
+                if retry_after is not None:
+                    delay = min(retry_after, max_backoff_seconds)
+                else:
+                    delay = min(random.uniform(initial_backoff_seconds, backoff * 3), max_backoff_seconds)
+                    backoff = delay
+                logging.info("Retrying '%s' in %.1f seconds", city, delay)
+                time.sleep(delay)
         except Exception as exc:
-            logging.exception("Unexpected error fetching weather for '%
+            logging.exception("Unexpected error fetching weather for '%s': %s", city, exc)
+            return None
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_s3_client():
+    """Return a process-wide S3 client so repeated runs (e.g. from the scheduler) reuse its connection pool.
+    The pool is larger than UPLOAD_WORKERS so parallel uploads never wait for a connection."""
+    import boto3
+    from botocore.config import Config as BotoConfig
+
+    return boto3.client("s3", config=BotoConfig(max_pool_connections=32))
+
 
 def build_s3_client():
-    """Build an S3 client using default AWS credential chain."""
-    return boto3.client("s3")
+    """Build an S3 client using default AWS credential chain (cached per process)."""
+    return get_s3_client()
+
 
+_CITY_KEY_TABLE = str.maketrans(" ", "_")
 
+
+@functools.lru_cache(maxsize=None)
 def normalize_city_for_key(city: str) -> str:
-    """Normalize city name for S3 key. Example: 'New York' -> 'new_york'"""
-    return city.strip().replace(" ", "_").lower()
+    """Normalize city name for S3 key. Example: 'New York' -> 'new_york'
+    Cached because the configured city list is fixed for the life of the process."""
+    return city.strip().translate(_CITY_KEY_TABLE).lower()
 
 
-def build_s3_key(city: str, ts: datetime) -> str:
-    """Build S3 key: YYYY/MM/DD/city_HHMMSS.json"""
-    date_part = ts.strftime("%Y/%m/%d")
-    time_part = ts.strftime("H%M%S")
+def build_s3_key(city: str, date_part: str, time_part: str) -> str:
+    """Build S3 key: YYYY/MM/DD/city_HHMMSS.json (date_part/time_part are pre-formatted once per run)"""
     city_part = normalize_city_for_key(city)
     return f"{date_part}/{city_part}_{time_part}.json"
 
 
-def upload_to_s3(client, bucket: str, key: str, payload: Dict[str, object]) -> bool:
-    """Upload JSON payload to S3."""
-    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+def build_batch_s3_key(date_part: str, time_part: str) -> str:
+    """Build S3 key for a multi-city batch: YYYY/MM/DD/batch_HHMMSS.ndjson"""
+    return f"{date_part}/batch_{time_part}.ndjson"
+
+
+def put_s3_object(client, bucket: str, key: str, body: bytes, content_type: str, gzip_body: bool = False) -> bool:
+    """Upload raw bytes to S3, optionally gzip-compressed with Content-Encoding: gzip."""
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    extra: Dict[str, str] = {}
+    if gzip_body:
+        body = gzip.compress(body, compresslevel=5)
+        extra["ContentEncoding"] = "gzip"
     try:
-        client.put_object(Bucket=bucket, Key=key, Body=body, ContentType="application/json")
+        # A seekable stream with a known length is sent as-is (and rewound on retry) without another copy.
+        client.put_object(
+            Bucket=bucket, Key=key, Body=io.BytesIO(body), ContentLength=len(body),
+            ContentType=content_type, **extra,
+        )
         logging.info("Uploaded to s3://%s/%s", bucket, key)
         return True
     except (ClientError, BotoCoreError) as exc:
@@ -254,29 +360,79 @@ def upload_to_s3(client, bucket: str, key: str, payload: Dict[str, object]) -> b
         return False
 
 
+def upload_to_s3(client, bucket: str, key: str, payload: Dict[str, object], gzip_body: bool = False) -> bool:
+    """Upload JSON payload to S3."""
+    return put_s3_object(client, bucket, key, orjson.dumps(payload), "application/json", gzip_body)
+
+
+def upload_per_city(
+    client, bucket: str, weathers: List[Tuple[str, WeatherData]], date_part: str, time_part: str,
+    gzip_body: bool = False,
+) -> List[bool]:
+    """Upload one JSON object per city in parallel. Returns per-city success flags."""
+    if not weathers:
+        return []
+    jobs = [(build_s3_key(city, date_part, time_part), weather) for city, weather in weathers]
+    # Each PutObject is an independent round-trip; the shared client's pool is sized for this.
+    with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(jobs))) as executor:
+        return list(executor.map(lambda job: upload_to_s3(client, bucket, job[0], job[1], gzip_body), jobs))
+
+
+def upload_batch(
+    client, bucket: str, weathers: List[Tuple[str, WeatherData]], date_part: str, time_part: str,
+    gzip_body: bool = False,
+) -> List[bool]:
+    """Upload all cities as a single newline-delimited JSON object. Returns per-city success flags."""
+    if not weathers:
+        return []
+    body = b"".join(orjson.dumps(weather, option=orjson.OPT_APPEND_NEWLINE) for _city, weather in weathers)
+    key = build_batch_s3_key(date_part, time_part)
+    ok = put_s3_object(client, bucket, key, body, "application/x-ndjson", gzip_body)
+    return [ok] * len(weathers)
+
+
 def process_cities(config: Config, client) -> Dict[str, object]:
     """Fetch weather for all cities and upload to S3."""
     total = len(config.cities)
     success_count = 0
     failure_count = 0
-    temps = []
     failures = []
-
-    for city in config.cities:
+    # Temperature stats are accumulated while tallying uploads, so no extra passes are needed.
+    temp_min = math.inf
+    temp_max = -math.inf
+    temp_sum = 0.0
+
+    # One timestamp per run: every city in the batch shares the same key prefix and timestamp_utc.
+    run_ts = datetime.now(timezone.utc)
+    timestamp_utc = run_ts.isoformat()
+    date_part = run_ts.strftime("%Y/%m/%d")
+    time_part = run_ts.strftime("%H%M%S")
+
+    # City requests are independent network round-trips, so issue them concurrently.
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, total)) as executor:
+        fetched = list(executor.map(lambda c: fetch_weather_with_retry(c, config, timestamp_utc), config.cities))
+
+    weathers: List[Tuple[str, WeatherData]] = []
+    for city, weather in zip(config.cities, fetched):
         logging.info("Processing city: %s", city)
-        weather = fetch_weather_with_retry(city, config)
         if weather is None:
             failure_count += 1
             failures.append(city)
             continue
+        weathers.append((city, weather))
 
-        ts = datetime.now(timezone.utc)
-        key = build_s3_key(city, ts)
-        uploaded = upload_to_s3(client, config.s3_bucket_name, key, weather)
+    upload = upload_batch if config.batch_upload else upload_per_city
+    uploaded = upload(client, config.s3_bucket_name, weathers, date_part, time_part, config.gzip_upload)
 
-        if uploaded:
+    for (city, weather), ok in zip(weathers, uploaded):
+        if ok:
             success_count += 1
-            temps.append(weather["temperature_c"])
+            temp = weather["temperature_c"]
+            temp_sum += temp
+            if temp < temp_min:
+                temp_min = temp
+            if temp > temp_max:
+                temp_max = temp
         else:
             failure_count += 1
             failures.append(city)
@@ -285,9 +441,9 @@ def process_cities(config: Config, client) -> Dict[str, object]:
         "total_cities": total,
         "success_count": success_count,
         "failure_count": failure_count,
-        "min_temp_c": min(temps) if temps else None,
-        "max_temp_c": max(temps) if temps else None,
-        "avg_temp_c": sum(temps) / len(temps) if temps else None,
+        "min_temp_c": temp_min if success_count else None,
+        "max_temp_c": temp_max if success_count else None,
+        "avg_temp_c": temp_sum / success_count if success_count else None,
         "failures": failures,
     }
     return summary
@@ -313,7 +469,7 @@ def main() -> int:
         return 1
 
     summary = process_cities(config, s3_client)
-    logging.info("Run summary: %s", json.dumps(summary, indent=2, default=str))
+    logging.info("Run summary: %s", orjson.dumps(summary, option=orjson.OPT_INDENT_2, default=str).decode("utf-8"))
 
     if summary["failure_count"] > 0:
         logging.warning("Completed with %d/%d failures.", summary["failure_count"], summary["total_cities"])